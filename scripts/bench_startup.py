@@ -0,0 +1,120 @@
+"""Benchmark the import cost that ``codeatlas`` adds to a CLI invocation.
+
+Runs ``python -X importtime -m codeatlas.cli --root <empty dir>`` several times
+in fresh interpreters, so imports deferred until a report is formatted are
+counted too.  Interpreter start-up and the standard library modules that any
+``argparse``/``pathlib``/``dataclasses`` program loads are measured once by a
+reference run and left out: the reported time is the summed *self* time of
+every other module, i.e. the ``codeatlas`` modules themselves plus whatever
+extra dependencies they pull in.  This keeps the number independent of how fast
+the machine runs the standard library.  Exits with status ``1`` when the best
+run exceeds the threshold or when a module the CLI path must not load (such as
+:mod:`textual`) was imported.
+
+Usage::
+
+    python scripts/bench_startup.py --runs 10 --threshold-ms 25
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+TARGET = "codeatlas.cli"
+DEFAULT_THRESHOLD_MS = 25.0
+# Program whose imports every CLI run pays for regardless of ``codeatlas``.
+REFERENCE = (
+    "import argparse, dataclasses, pathlib, runpy; "
+    "argparse.ArgumentParser().parse_args([])"
+)
+
+# Modules that are only needed by the TUI, the server or a specific formatter.
+FORBIDDEN = (
+    "textual",
+    "pyperclip",
+    "asyncio",
+    "json",
+    "codeatlas.tui",
+    "codeatlas.server",
+)
+
+
+def _importtime(args: list[str]) -> dict[str, int]:
+    """Run ``python -X importtime *args`` and return each module's self time in us."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC), env.get("PYTHONPATH")]))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imports: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header line
+        imports[fields[2].strip()] = int(fields[0])
+    return imports
+
+
+def measure(root: Path, reference: set[str]) -> tuple[float, set[str]]:
+    """Return the added import time of a CLI run on ``root`` in ms and all modules.
+
+    Modules in ``reference`` are loaded by any comparable program and not counted.
+    """
+    imports = _importtime(["-m", TARGET, "--root", str(root)])
+    if "codeatlas" not in imports:
+        raise RuntimeError("codeatlas missing from -X importtime output")
+    self_us = sum(us for name, us in imports.items() if name not in reference)
+    return self_us / 1000, set(imports)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--threshold-ms",
+        type=float,
+        default=float(os.environ.get("CODEATLAS_STARTUP_MS", DEFAULT_THRESHOLD_MS)),
+    )
+    args = parser.parse_args(argv)
+
+    timings: list[float] = []
+    modules: set[str] = set()
+    reference = set(_importtime(["-c", REFERENCE]))
+    with tempfile.TemporaryDirectory() as root:
+        for _ in range(args.runs):
+            elapsed, imported = measure(Path(root), reference)
+            timings.append(elapsed)
+            modules |= imported
+
+    best = min(timings)
+    print(
+        f"{TARGET} --root <empty>, added imports: best {best:.1f} ms, "
+        f"worst {max(timings):.1f} ms over {args.runs} runs (threshold {args.threshold_ms:.1f} ms)"
+    )
+    failed = False
+    leaked = sorted(
+        m for m in modules if m in FORBIDDEN or m.split(".")[0] in FORBIDDEN
+    )
+    if leaked:
+        print(f"FAIL: CLI path imports {', '.join(leaked)}")
+        failed = True
+    if best > args.threshold_ms:
+        print(f"FAIL: added import time regressed above {args.threshold_ms:.1f} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -1,30 +1,179 @@
-"""Command line interface for CodeAtlas."""
+"""Command line interface for CodeAtlas.
+
+The CLI is invoked frequently from scripts and hooks, so modules that only
+some subcommands need (formatters, the report server) are imported lazily.
+"""
 
 from __future__ import annotations
 
 import argparse
+import sys
+from importlib import import_module
 from pathlib import Path
 from .scanner import scan
 
+# Output format -> formatter module providing ``iter_<format>`` and
+# ``summary_to_<format>``.
+_FORMATTERS = {
+    "text": ".formatter.text",
+    "markdown": ".formatter.markdown",
+    "json": ".formatter.json_",
+}
+
+
+def _line_count(value: str) -> int:
+    """Parse a non-negative number of lines."""
+    try:
+        count = int(value)
+    except ValueError:
+        count = -1
+    if count < 0:
+        raise argparse.ArgumentTypeError(f"expected a line count, got {value!r}")
+    return count
+
+
+def _line_range(value: str) -> tuple[str, tuple[int, int | None]]:
+    """Parse a ``PATTERN:FIRST-LAST`` option into a pattern and line range.
+
+    ``LAST`` may be omitted (``FIRST-``) to read to the end of the file, and
+    ``FIRST`` alone selects a single line.
+    """
+    pattern, sep, lines = value.rpartition(":")
+    first, dash, last = lines.partition("-")
+    try:
+        start = int(first)
+        stop = (int(last) if last else None) if dash else start
+    except ValueError:
+        stop = start = 0
+    if not sep or not pattern or start < 1 or (stop is not None and stop < start):
+        raise argparse.ArgumentTypeError(
+            f"expected PATTERN:FIRST-LAST with 1 <= FIRST <= LAST, got {value!r}"
+        )
+    return pattern, (start, stop)
+
+
+def _serve(argv: list[str]) -> int:
+    """Run the ``serve`` subcommand."""
+    parser = argparse.ArgumentParser(
+        prog="codeatlas serve",
+        description="Serve reports for ROOT over HTTP from warm in-memory indexes.",
+    )
+    parser.add_argument("--root", type=Path, action="append", default=None)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix-socket", type=Path, default=None)
+    parser.add_argument("--ttl", type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    from .server import serve
+
+    serve(
+        args.root or [Path(".")],
+        host=args.host,
+        port=args.port,
+        unix_socket=args.unix_socket,
+        ttl=args.ttl,
+    )
+    return 0
+
 
 def main(argv: list[str] | None = None) -> int:
-    parser = argparse.ArgumentParser(prog="codeatlas")
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] == "serve":
+        return _serve(argv[1:])
+
+    parser = argparse.ArgumentParser(
+        prog="codeatlas",
+        epilog="Run 'codeatlas serve --help' to start the report server.",
+    )
     parser.add_argument("--root", type=Path, default=Path("."))
     parser.add_argument("--include", action="append", default=None)
     parser.add_argument("--exclude", action="append", default=None)
     parser.add_argument("--content", action="store_true")
     parser.add_argument("--max-bytes", type=int, default=None)
+    parser.add_argument(
+        "--head-lines",
+        type=_line_count,
+        default=None,
+        metavar="N",
+        help="inline only the first N lines of each file (implies --content)",
+    )
+    parser.add_argument(
+        "--tail-lines",
+        type=_line_count,
+        default=None,
+        metavar="N",
+        help="inline only the last N lines of each file (implies --content)",
+    )
+    parser.add_argument(
+        "--lines",
+        type=_line_range,
+        action="append",
+        default=None,
+        metavar="PATTERN:FIRST-LAST",
+        help="inline only these lines of files matching PATTERN",
+    )
+    parser.add_argument("--format", choices=sorted(_FORMATTERS), default="text")
+    parser.add_argument(
+        "--summary",
+        action="store_true",
+        help="report per-directory and per-extension totals instead of files",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="number of directories, extensions and files listed by --summary",
+    )
     args = parser.parse_args(argv)
+    if args.summary:
+        ignored = [
+            option
+            for option, value in (
+                ("--content", args.content),
+                ("--max-bytes", args.max_bytes is not None),
+                ("--head-lines", args.head_lines is not None),
+                ("--tail-lines", args.tail_lines is not None),
+                ("--lines", args.lines is not None),
+            )
+            if value
+        ]
+        if ignored:
+            parser.error(f"--summary cannot be combined with {', '.join(ignored)}")
+        if args.top < 0:
+            parser.error(f"--top must not be negative, got {args.top}")
+
+    formatters = import_module(_FORMATTERS[args.format], __package__)
+    if args.summary:
+        from .summary import summarize
+
+        summary = summarize(
+            args.root, include=args.include, exclude=args.exclude, top=args.top
+        )
+        print(getattr(formatters, f"summary_to_{args.format}")(summary))
+        return 0
 
+    line_ranges = dict(args.lines) if args.lines else None
     entries = scan(
         args.root,
         include=args.include,
         exclude=args.exclude,
-        include_contents=args.content,
+        # --lines alone inlines only the files matching its patterns.
+        include_contents=args.content
+        or args.head_lines is not None
+        or args.tail_lines is not None,
         max_bytes=args.max_bytes,
+        head_lines=args.head_lines,
+        tail_lines=args.tail_lines,
+        line_ranges=line_ranges,
     )
-    for entry in entries:
-        print(entry)
+    wrote = False
+    for piece in getattr(formatters, f"iter_{args.format}")(entries):
+        sys.stdout.write(piece)
+        wrote = True
+    if wrote:
+        sys.stdout.write("\n")
     return 0
 
 
@@ -2,9 +2,17 @@
 
 from __future__ import annotations
 
+import codecs
+import os
+from io import BufferedIOBase
 from pathlib import Path
 
-__all__ = ["read_text", "detect_encoding"]
+__all__ = ["read_text", "detect_encoding", "OMISSION_MARKER"]
+
+# Bytes read per step when scanning for line boundaries.
+_CHUNK_SIZE = 64 * 1024
+# Line put between selected lines that are not adjacent in the file.
+OMISSION_MARKER = "\u2026\n"
 
 
 def detect_encoding(data: bytes) -> str:
@@ -16,19 +24,145 @@ def detect_encoding(data: bytes) -> str:
         return "latin-1"
 
 
-def read_text(path: Path, max_bytes: int | None = None) -> str:
+def _skip_lines(fh: BufferedIOBase, count: int) -> int:
+    """Read past ``count`` lines from the current position and return the offset.
+
+    The returned offset is just after the last newline consumed, or the end
+    of the file if it has fewer lines.
+    """
+    offset = fh.tell()
+    while count > 0:
+        chunk = fh.read(_CHUNK_SIZE)
+        if not chunk:
+            break
+        pos = -1
+        while count > 0 and (pos := chunk.find(b"\n", pos + 1)) >= 0:
+            count -= 1
+        if count == 0:
+            return offset + pos + 1
+        offset += len(chunk)
+    return offset
+
+
+def _tail_start(fh: BufferedIOBase, size: int, count: int) -> int:
+    """Return the offset at which the last ``count`` lines of ``fh`` start.
+
+    The file is read backwards in chunks from its end.
+    """
+    if count <= 0:
+        return size
+    pos = size
+    if size:
+        # A trailing newline ends the last line rather than starting a new one.
+        fh.seek(size - 1)
+        if fh.read(1) == b"\n":
+            pos -= 1
+    while pos > 0:
+        start = max(0, pos - _CHUNK_SIZE)
+        fh.seek(start)
+        chunk = fh.read(pos - start)
+        idx = len(chunk)
+        while (idx := chunk.rfind(b"\n", 0, idx)) >= 0:
+            count -= 1
+            if count == 0:
+                return start + idx + 1
+        pos = start
+    return 0
+
+
+def _line_spans(
+    fh: BufferedIOBase,
+    head_lines: int | None,
+    tail_lines: int | None,
+    line_range: tuple[int, int | None] | None,
+) -> list[tuple[int, int]]:
+    """Return the ``(start, stop)`` byte offsets of the selected lines."""
+    size = fh.seek(0, os.SEEK_END)
+    if line_range is not None:
+        first, last = line_range
+        if first < 1 or (last is not None and last < first):
+            raise ValueError(f"invalid line range: {first}-{last}")
+        fh.seek(0)
+        start = _skip_lines(fh, first - 1)
+        if last is None:
+            return [(start, size)]
+        fh.seek(start)
+        return [(start, _skip_lines(fh, last - first + 1))]
+
+    if (head_lines is not None and head_lines < 0) or (
+        tail_lines is not None and tail_lines < 0
+    ):
+        raise ValueError("line counts must not be negative")
+    spans: list[tuple[int, int]] = []
+    head_stop = 0
+    if head_lines is not None:
+        fh.seek(0)
+        head_stop = _skip_lines(fh, head_lines)
+        spans.append((0, head_stop))
+    if tail_lines is not None:
+        tail_start = _tail_start(fh, size, tail_lines)
+        if tail_start <= head_stop:
+            spans = [(0, size)]
+        else:
+            spans.append((tail_start, size))
+    return spans
+
+
+def read_text(
+    path: Path,
+    max_bytes: int | None = None,
+    *,
+    head_lines: int | None = None,
+    tail_lines: int | None = None,
+    line_range: tuple[int, int | None] | None = None,
+) -> str:
     """Read ``path`` and return decoded text.
 
+    When lines are selected only the parts of the file needed to find them
+    are read, and lines are never split.
+
     Parameters
     ----------
     path:
         The file to read.
     max_bytes:
-        Maximum number of bytes to read. ``None`` means no limit.
+        Maximum number of bytes to read. ``None`` means no limit. A UTF-8
+        character cut by the limit is dropped. Ignored when lines are selected.
+    head_lines:
+        Return only the first ``head_lines`` lines.
+    tail_lines:
+        Return only the last ``tail_lines`` lines, found by reading backwards
+        from the end of the file. Combined with ``head_lines`` both parts are
+        returned, without repeating lines they share, separated by
+        :data:`OMISSION_MARKER` when lines between them were left out.
+    line_range:
+        ``(first, last)`` line numbers to return, 1-based and inclusive.
+        ``last`` may be ``None`` to read to the end of the file. Takes
+        precedence over ``head_lines`` and ``tail_lines``.
     """
-    num = max_bytes if max_bytes is not None else -1
     with path.open("rb") as fh:
-        data = fh.read(num)
+        if head_lines is None and tail_lines is None and line_range is None:
+            num = max_bytes if max_bytes is not None else -1
+            data = fh.read(num)
+            if max_bytes is not None and len(data) == max_bytes:
+                # A character cut in half by the limit is dropped rather than
+                # making the whole text look like it is not UTF-8.
+                try:
+                    return codecs.getincrementaldecoder("utf-8")().decode(data)
+                except UnicodeDecodeError:
+                    return data.decode("latin-1")
+        else:
+            parts: list[bytes] = []
+            for start, stop in _line_spans(fh, head_lines, tail_lines, line_range):
+                if stop > start:
+                    fh.seek(start)
+                    parts.append(fh.read(stop - start))
+            if len(parts) > 1:
+                encoding = detect_encoding(b"".join(parts))
+                return OMISSION_MARKER.join(
+                    part.decode(encoding, errors="replace") for part in parts
+                )
+            data = b"".join(parts)
 
     encoding = detect_encoding(data)
     return data.decode(encoding, errors="replace")
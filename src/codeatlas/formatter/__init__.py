@@ -2,11 +2,52 @@
 
 This module exposes simple helpers for turning :class:`~codeatlas.scanner.FileEntry`
 objects into different textual representations.  The individual formatters live in
-``text.py``, ``markdown.py`` and ``json_.py``.
+``text.py``, ``markdown.py`` and ``json_.py``.  Each ``to_*`` helper has an
+``iter_*`` counterpart that yields the same document in pieces for streaming,
+and ``summary_to_*`` renders a :class:`~codeatlas.summary.Summary`.
+
+The helpers are imported on first access so that using one formatter does not
+pay for loading the others.
 """
 
-from .text import to_text
-from .markdown import to_markdown
-from .json_ import to_json
+from __future__ import annotations
+
+from importlib import import_module
+
+_MODULES = {
+    "to_text": ".text",
+    "iter_text": ".text",
+    "summary_to_text": ".text",
+    "to_markdown": ".markdown",
+    "iter_markdown": ".markdown",
+    "summary_to_markdown": ".markdown",
+    "to_json": ".json_",
+    "iter_json": ".json_",
+    "summary_to_json": ".json_",
+}
+
+__all__ = [
+    "to_text",
+    "to_markdown",
+    "to_json",
+    "iter_text",
+    "iter_markdown",
+    "iter_json",
+    "summary_to_text",
+    "summary_to_markdown",
+    "summary_to_json",
+]
+
+
+def __getattr__(name: str) -> object:
+    try:
+        module = _MODULES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ["to_text", "to_markdown", "to_json"]
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
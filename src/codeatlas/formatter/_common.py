@@ -0,0 +1,16 @@
+"""Helpers shared by the formatters."""
+
+from __future__ import annotations
+
+
+def format_mtime(mtime: float | None) -> str:
+    """Return ``mtime`` as a local ``YYYY-MM-DD HH:MM:SS`` timestamp.
+
+    ``None``, the newest time of an empty group, is rendered as ``-``.
+    """
+    if mtime is None:
+        return "-"
+    # Imported here so listing files never pays for :mod:`datetime`.
+    from datetime import datetime
+
+    return datetime.fromtimestamp(mtime).isoformat(sep=" ", timespec="seconds")
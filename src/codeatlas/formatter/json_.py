@@ -3,21 +3,98 @@
 from __future__ import annotations
 
 import json
-from typing import Iterable
+from collections.abc import Iterable, Iterator
 
-from ..scanner import FileEntry
+from ..scanner import TYPE_CHECKING, FileEntry
+
+if TYPE_CHECKING:
+    from ..summary import Aggregate, Summary
+
+
+def _entry_dict(entry: FileEntry) -> dict[str, object]:
+    """Return the JSON-serializable mapping for ``entry``."""
+
+    return {
+        "path": entry.path.as_posix(),
+        "size": entry.size,
+        "mtime": entry.mtime,
+        "content": entry.content,
+    }
+
+
+# ``json.dumps(..., indent=2)`` runs the pure-Python encoder, which dominates
+# the cost of large reports.  Entries are laid out by hand instead; strings go
+# through the C-accelerated string encoder and numbers use ``repr`` like
+# :mod:`json` does.
+_encode_str = json.encoder.encode_basestring
+
+
+def _format_entry(entry: FileEntry) -> str:
+    """Return ``entry`` as an element of the indented JSON array."""
+
+    content = "null" if entry.content is None else _encode_str(entry.content)
+    return (
+        '{\n    "path": '
+        + _encode_str(entry.path.as_posix())
+        + ',\n    "size": '
+        + repr(entry.size)
+        + ',\n    "mtime": '
+        + repr(entry.mtime)
+        + ',\n    "content": '
+        + content
+        + "\n  }"
+    )
+
+
+def iter_json(entries: Iterable[FileEntry]) -> Iterator[str]:
+    """Yield the JSON array for ``entries`` piece by piece.
+
+    The concatenated output is identical to ``json.dumps`` of the entry
+    mappings with ``indent=2``; each element is encoded on its own so that
+    large reports can be streamed.
+    """
+
+    empty = True
+    for entry in entries:
+        yield ("[\n  " if empty else ",\n  ") + _format_entry(entry)
+        empty = False
+    yield "[]" if empty else "\n]"
 
 
 def to_json(entries: Iterable[FileEntry]) -> str:
     """Return ``entries`` serialized as a JSON string."""
 
-    data = [
-        {
-            "path": e.path.as_posix(),
-            "size": e.size,
-            "mtime": e.mtime,
-            "content": e.content,
-        }
-        for e in entries
-    ]
+    return "".join(iter_json(entries))
+
+
+def _aggregate_dict(agg: Aggregate) -> dict[str, object]:
+    return {"files": agg.files, "size": agg.size, "newest": agg.newest}
+
+
+def summary_to_json(summary: Summary) -> str:
+    """Return ``summary`` serialized as a JSON string.
+
+    ``directories`` and ``extensions`` list only the ``top`` largest groups.
+    """
+
+    data = {
+        "root": summary.root.as_posix(),
+        "total": _aggregate_dict(summary.total),
+        "directories": [
+            {"path": path.as_posix(), **_aggregate_dict(agg)}
+            for path, agg in summary.top_directories()
+        ],
+        "extensions": [
+            {"extension": ext, **_aggregate_dict(agg)}
+            for ext, agg in summary.top_extensions()
+        ],
+        "largest": [
+            {"path": e.path.as_posix(), "size": e.size, "mtime": e.mtime}
+            for e in summary.largest
+        ],
+        "newest": [
+            {"path": e.path.as_posix(), "size": e.size, "mtime": e.mtime}
+            for e in summary.newest
+        ],
+    }
     return json.dumps(data, ensure_ascii=False, indent=2)
@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
-from typing import Iterable
+from collections.abc import Iterable, Iterator
 
-from ..scanner import FileEntry
+from ..scanner import TYPE_CHECKING, FileEntry
+from ._common import format_mtime
+
+if TYPE_CHECKING:
+    from ..summary import Aggregate, Summary
 
 
 def _format_entry(entry: FileEntry) -> str:
@@ -18,7 +22,61 @@ def _format_entry(entry: FileEntry) -> str:
     return "\n".join(lines)
 
 
+def iter_markdown(entries: Iterable[FileEntry]) -> Iterator[str]:
+    """Yield the Markdown document for ``entries`` piece by piece."""
+
+    for index, entry in enumerate(entries):
+        yield _format_entry(entry) if index == 0 else "\n\n" + _format_entry(entry)
+
+
 def to_markdown(entries: Iterable[FileEntry]) -> str:
     """Return ``entries`` serialized as a Markdown document."""
 
-    return "\n\n".join(_format_entry(e) for e in entries)
+    return "".join(iter_markdown(entries))
+
+
+def _aggregate_table(header: str, rows: list[tuple[str, Aggregate]]) -> list[str]:
+    lines = [
+        f"| {header} | Size | Files | Newest |",
+        "| --- | ---: | ---: | --- |",
+    ]
+    for label, agg in rows:
+        newest = format_mtime(agg.newest)
+        lines.append(f"| `{label}` | {agg.size} | {agg.files} | {newest} |")
+    return lines
+
+
+def _file_table(entries: list[FileEntry]) -> list[str]:
+    lines = ["| File | Size | Modified |", "| --- | ---: | --- |"]
+    for e in entries:
+        lines.append(f"| `{e.path.as_posix()}` | {e.size} | {format_mtime(e.mtime)} |")
+    return lines
+
+
+def summary_to_markdown(summary: Summary) -> str:
+    """Return ``summary`` serialized as a Markdown document."""
+
+    total = summary.total
+    lines = [
+        f"## Summary of `{summary.root.as_posix()}`",
+        "",
+        f"- files: {total.files}",
+        f"- size: {total.size}",
+        f"- newest: {format_mtime(total.newest)}",
+        "",
+        "### Largest directories",
+        "",
+    ]
+    lines += _aggregate_table(
+        "Directory",
+        [(f"{path.as_posix()}/", agg) for path, agg in summary.top_directories()],
+    )
+    lines += ["", "### Largest extensions", ""]
+    lines += _aggregate_table(
+        "Extension", [(ext or "(none)", agg) for ext, agg in summary.top_extensions()]
+    )
+    lines += ["", "### Largest files", ""]
+    lines += _file_table(summary.largest)
+    lines += ["", "### Newest files", ""]
+    lines += _file_table(summary.newest)
+    return "\n".join(lines)
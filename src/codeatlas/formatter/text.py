@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
-from typing import Iterable
+from collections.abc import Iterable, Iterator
 
-from ..scanner import FileEntry
+from ..scanner import TYPE_CHECKING, FileEntry
+from ._common import format_mtime
+
+if TYPE_CHECKING:
+    from ..summary import Aggregate, Summary
 
 
 def _format_entry(entry: FileEntry) -> str:
@@ -16,7 +20,43 @@ def _format_entry(entry: FileEntry) -> str:
     return f"{line}\n{entry.content}"
 
 
+def iter_text(entries: Iterable[FileEntry]) -> Iterator[str]:
+    """Yield the plain text document for ``entries`` piece by piece."""
+
+    for index, entry in enumerate(entries):
+        yield _format_entry(entry) if index == 0 else "\n" + _format_entry(entry)
+
+
 def to_text(entries: Iterable[FileEntry]) -> str:
     """Return ``entries`` serialized as a plain text document."""
 
-    return "\n".join(_format_entry(e) for e in entries)
+    return "".join(iter_text(entries))
+
+
+def _format_aggregate(label: str, agg: Aggregate) -> str:
+    newest = format_mtime(agg.newest)
+    return f"{label} (size={agg.size}, files={agg.files}, newest={newest})"
+
+
+def summary_to_text(summary: Summary) -> str:
+    """Return ``summary`` serialized as a plain text report."""
+
+    lines = [_format_aggregate(f"Summary of {summary.root.as_posix()}", summary.total)]
+    lines += ["", "Largest directories:"]
+    lines += [
+        "  " + _format_aggregate(f"{path.as_posix()}/", agg)
+        for path, agg in summary.top_directories()
+    ]
+    lines += ["", "Largest extensions:"]
+    lines += [
+        "  " + _format_aggregate(ext or "(none)", agg)
+        for ext, agg in summary.top_extensions()
+    ]
+    lines += ["", "Largest files:"]
+    lines += [f"  {e.path.as_posix()} (size={e.size})" for e in summary.largest]
+    lines += ["", "Newest files:"]
+    lines += [
+        f"  {e.path.as_posix()} (mtime={format_mtime(e.mtime)})"
+        for e in summary.newest
+    ]
+    return "\n".join(lines)
@@ -2,9 +2,34 @@
 
 from __future__ import annotations
 
+import fnmatch
+import os
+import re
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+)
 from dataclasses import dataclass
-from pathlib import Path
-from typing import Iterable, List
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path, PurePath
+
+from .extractor import read_text
+
+# Equivalent to ``typing.TYPE_CHECKING`` without importing :mod:`typing` (or
+# :mod:`concurrent.futures`) on the CLI start-up path.  The formatters import
+# it from here for their annotation-only imports; modules off that path use
+# ``typing.TYPE_CHECKING`` directly.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+# Number of files handed between :func:`ascan` pipeline stages at once.
+_ASCAN_BATCH = 64
 
 
 @dataclass
@@ -17,15 +42,228 @@ class FileEntry:
     content: str | None = None
 
 
+@lru_cache(maxsize=256)
+def _compile_pattern(pattern: str) -> Callable[[Path], bool]:
+    """Return a predicate equivalent to ``path.match(pattern)``.
+
+    :meth:`pathlib.PurePath.match` parses the pattern on every call, which
+    dominates filtering large trees.  Relative patterns are split into parts
+    once here and matched against the trailing parts of each path.
+    """
+    pure = PurePath(pattern)
+    if pure.anchor or not pure.parts:
+        return lambda path: path.match(pattern)
+    normcase = str.lower if os.name == "nt" else None
+    if normcase is not None:
+        pure = PurePath(normcase(pattern))
+    tests = [re.compile(fnmatch.translate(part)).match for part in pure.parts]
+    tests.reverse()
+    count = len(tests)
+    if count == 1 and normcase is None:
+        # Most patterns only look at the file name, which is cheaper than parts.
+        test = tests[0]
+        return lambda path: bool(path.name) and test(path.name) is not None
+
+    def match(path: Path) -> bool:
+        parts = path.parts
+        if len(parts) < count:
+            return False
+        for test, part in zip(tests, reversed(parts)):
+            if test(normcase(part) if normcase else part) is None:
+                return False
+        return True
+
+    return match
+
+
 def _matches(path: Path, patterns: Iterable[str] | None) -> bool:
     if not patterns:
         return True
     for pattern in patterns:
-        if path.match(pattern):
+        if _compile_pattern(pattern)(path):
             return True
     return False
 
 
+def is_selected(
+    rel: Path, include: Iterable[str] | None, exclude: Iterable[str] | None
+) -> bool:
+    """Return ``True`` if ``rel`` passes the ``include``/``exclude`` patterns.
+
+    ``rel`` is a path relative to the scanned root.  It is selected when it
+    matches any ``include`` pattern (or ``include`` is ``None``) and no
+    ``exclude`` pattern, using :meth:`pathlib.PurePath.match` semantics.
+    """
+    if include is not None and not _matches(rel, include):
+        return False
+    if exclude is not None and _matches(rel, exclude):
+        return False
+    return True
+
+
+@dataclass(frozen=True)
+class _ContentSpec:
+    """Which part of each file's contents a scan reads.
+
+    Files matching one of ``line_ranges`` are always read; the others only
+    when ``include_contents`` is set.
+    """
+
+    include_contents: bool = False
+    max_bytes: int | None = None
+    head_lines: int | None = None
+    tail_lines: int | None = None
+    line_ranges: tuple[tuple[str, tuple[int, int | None]], ...] = ()
+
+    @property
+    def reads(self) -> bool:
+        """Whether any file may have its contents read."""
+        return self.include_contents or bool(self.line_ranges)
+
+    def read(self, path: Path, rel: Path) -> str | None:
+        """Return the selected contents of ``path`` (``rel`` relative to the root).
+
+        ``None`` is returned for files whose contents are not included.
+        """
+        for pattern, line_range in self.line_ranges:
+            if _compile_pattern(pattern)(rel):
+                return read_text(path, line_range=line_range)
+        if not self.include_contents:
+            return None
+        return read_text(
+            path,
+            self.max_bytes,
+            head_lines=self.head_lines,
+            tail_lines=self.tail_lines,
+        )
+
+
+def _list_dir(path: Path) -> list[tuple[str, bool]]:
+    """Return ``(name, is_dir)`` for the children of ``path`` in scan order.
+
+    Symlinks to directories are omitted, matching :meth:`Path.rglob`, and
+    unreadable directories are treated as empty.
+    """
+    try:
+        with os.scandir(path) as it:
+            children = list(it)
+    except OSError:
+        return []
+    listing: list[tuple[str, bool]] = []
+    for entry in sorted(children, key=lambda e: os.path.normcase(e.name)):
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        if is_dir and entry.is_symlink():
+            continue
+        listing.append((entry.name, is_dir))
+    return listing
+
+
+def _stat_batch(
+    root: Path, batch: list[Path], skip_missing: bool = False
+) -> list[FileEntry]:
+    """Return a :class:`FileEntry` without contents for each path in ``batch``."""
+    entries = []
+    for rel in batch:
+        try:
+            stat = (root / rel).stat()
+        except FileNotFoundError:
+            if skip_missing:
+                continue
+            raise
+        entries.append(FileEntry(path=rel, size=stat.st_size, mtime=stat.st_mtime))
+    return entries
+
+
+def _read_batch(
+    root: Path, batch: list[FileEntry], spec: _ContentSpec, skip_missing: bool = False
+) -> list[FileEntry]:
+    """Fill in the contents of the entries in ``batch``."""
+    entries = []
+    for entry in batch:
+        try:
+            entry.content = spec.read(root / entry.path, entry.path)
+        except FileNotFoundError:
+            if skip_missing:
+                continue
+            raise
+        entries.append(entry)
+    return entries
+
+
+def _walk(root: Path) -> Iterator[Path]:
+    """Yield the files below ``root`` relative to it, in sorted depth-first order.
+
+    Only the listings of the directories on the current path are held in
+    memory, never the whole tree.
+    """
+    stack = [(Path(), iter(_list_dir(root)))]
+    while stack:
+        rel_dir, children = stack[-1]
+        for name, is_dir in children:
+            rel = rel_dir / name
+            if is_dir:
+                stack.append((rel, iter(_list_dir(root / rel))))
+                break
+            yield rel
+        else:
+            stack.pop()
+
+
+def _iter_selected(
+    root: Path, include: Iterable[str] | None, exclude: Iterable[str] | None
+) -> Iterator[Path]:
+    """Yield the files of :func:`_walk` that pass the ``include``/``exclude``."""
+    return (rel for rel in _walk(root) if is_selected(rel, include, exclude))
+
+
+def _take(files: Iterator[Path]) -> list[Path]:
+    """Return the next :data:`_ASCAN_BATCH` paths of ``files``."""
+    return list(islice(files, _ASCAN_BATCH))
+
+
+def iter_scan(
+    root: Path,
+    *,
+    include: Iterable[str] | None = None,
+    exclude: Iterable[str] | None = None,
+    include_contents: bool = False,
+    max_bytes: int | None = None,
+    head_lines: int | None = None,
+    tail_lines: int | None = None,
+    line_ranges: Mapping[str, tuple[int, int | None]] | None = None,
+    skip_missing: bool = False,
+) -> Iterator[FileEntry]:
+    """Lazily scan ``root``, yielding :class:`FileEntry` objects one at a time.
+
+    Parameters are the same as for :func:`scan`.  Use this instead of
+    :func:`scan` when the entries are consumed once and need not be retained.
+    """
+    root = Path(root)
+    spec = _ContentSpec(
+        include_contents=include_contents,
+        max_bytes=max_bytes,
+        head_lines=head_lines,
+        tail_lines=tail_lines,
+        line_ranges=tuple((line_ranges or {}).items()),
+    )
+    for rel in _iter_selected(root, include, exclude):
+        path = root / rel
+        try:
+            stat = path.stat()
+            content = spec.read(path, rel) if spec.reads else None
+        except FileNotFoundError:
+            if skip_missing:
+                continue
+            raise
+
+        yield FileEntry(
+            path=rel, size=stat.st_size, mtime=stat.st_mtime, content=content
+        )
+
+
 def scan(
     root: Path,
     *,
@@ -33,7 +271,11 @@ def scan(
     exclude: Iterable[str] | None = None,
     include_contents: bool = False,
     max_bytes: int | None = None,
-) -> List[FileEntry]:
+    head_lines: int | None = None,
+    tail_lines: int | None = None,
+    line_ranges: Mapping[str, tuple[int, int | None]] | None = None,
+    skip_missing: bool = False,
+) -> list[FileEntry]:
     """Recursively scan ``root`` and return a list of :class:`FileEntry`.
 
     Parameters
@@ -46,33 +288,142 @@ def scan(
     exclude:
         Glob patterns to exclude. Checked after ``include``.
     include_contents:
-        Whether to read file contents.
+        Whether to read the contents of every file.  Files matching
+        ``line_ranges`` are read regardless.
     max_bytes:
         If ``include_contents`` is ``True``, read at most this many bytes from
-        each file.
+        each file. Ignored for files whose lines are selected.
+    head_lines, tail_lines:
+        Read only the first and/or last lines of each file, as for
+        :func:`~codeatlas.extractor.read_text`, without reading whole files.
+    line_ranges:
+        Mapping of glob patterns to ``(first, last)`` line ranges. Files
+        matching a pattern get only those lines (the first matching pattern
+        wins) instead of ``head_lines``/``tail_lines``, even when
+        ``include_contents`` is ``False``.
+    skip_missing:
+        Leave out files that vanish between the directory listing and reading
+        them, and dangling symlinks, instead of raising ``FileNotFoundError``.
+    """
+    return list(
+        iter_scan(
+            root,
+            include=include,
+            exclude=exclude,
+            include_contents=include_contents,
+            max_bytes=max_bytes,
+            head_lines=head_lines,
+            tail_lines=tail_lines,
+            line_ranges=line_ranges,
+            skip_missing=skip_missing,
+        )
+    )
+
+
+async def ascan(
+    root: Path,
+    *,
+    include: Iterable[str] | None = None,
+    exclude: Iterable[str] | None = None,
+    include_contents: bool = False,
+    max_bytes: int | None = None,
+    head_lines: int | None = None,
+    tail_lines: int | None = None,
+    line_ranges: Mapping[str, tuple[int, int | None]] | None = None,
+    skip_missing: bool = False,
+    queue_size: int = 8,
+    executor: ThreadPoolExecutor | None = None,
+) -> AsyncIterator[FileEntry]:
+    """Asynchronously scan ``root``, yielding :class:`FileEntry` objects.
+
+    Directory listing, ``stat`` calls and content reads run as separate
+    pipeline stages in ``executor``, so enumeration overlaps with reading.
+    The stages are connected by bounded queues and a slow consumer throttles
+    the whole pipeline.  Entries are yielded in the same order as :func:`scan`.
+    Cancelling the consumer or closing the iterator stops all stages.
+
+    Parameters
+    ----------
+    queue_size:
+        Maximum number of batches buffered between two stages.  Must be at
+        least ``1``; a ``ValueError`` is raised when iteration starts otherwise.
+    executor:
+        Thread pool running the blocking calls.  ``None`` uses the loop's
+        default.  Process pools are rejected with ``TypeError``: the listing
+        stage advances a single directory walk across calls, and that walk
+        cannot be sent to another process.
+
+    The remaining parameters are the same as for :func:`scan`.
     """
+    if queue_size < 1:
+        raise ValueError(f"queue_size must be at least 1, got {queue_size}")
+    import asyncio
+    from concurrent.futures import ProcessPoolExecutor
+
+    if isinstance(executor, ProcessPoolExecutor):
+        raise TypeError("ascan needs a thread-based executor, not a process pool")
+
     root = Path(root)
-    entries: List[FileEntry] = []
+    loop = asyncio.get_running_loop()
+    spec = _ContentSpec(
+        include_contents=include_contents,
+        max_bytes=max_bytes,
+        head_lines=head_lines,
+        tail_lines=tail_lines,
+        line_ranges=tuple((line_ranges or {}).items()),
+    )
 
-    for path in sorted(root.rglob("*")):
-        rel = path.relative_to(root)
-        if path.is_dir():
-            continue
-        if include is not None and not _matches(rel, include):
-            continue
-        if exclude is not None and _matches(rel, exclude):
-            continue
+    # Queues carry lists of paths or entries; ``None`` marks the end of a stage
+    # and an exception instance reports a failure upstream.
+    async def receive(queue: asyncio.Queue) -> list | None:
+        batch = await queue.get()
+        if isinstance(batch, Exception):
+            raise batch
+        return batch
 
-        stat = path.stat()
-        content: str | None = None
-        if include_contents:
-            num = max_bytes if max_bytes is not None else -1
-            with path.open("rb") as fh:
-                data = fh.read(num)
-            content = data.decode("utf-8", errors="replace")
+    async def stage(body: Awaitable[None], out: asyncio.Queue) -> None:
+        try:
+            await body
+        except Exception as exc:
+            await out.put(exc)
+        else:
+            await out.put(None)
 
-        entries.append(
-            FileEntry(path=rel, size=stat.st_size, mtime=stat.st_mtime, content=content)
-        )
+    files = _iter_selected(root, include, exclude)
 
-    return entries
+    async def list_files(out: asyncio.Queue) -> None:
+        # The walk advances in the executor, one batch of selected files at a time.
+        while batch := await loop.run_in_executor(executor, _take, files):
+            await out.put(batch)
+
+    async def transform(
+        inp: asyncio.Queue,
+        out: asyncio.Queue,
+        func: Callable[..., list],
+        *args: object,
+    ) -> None:
+        while (batch := await receive(inp)) is not None:
+            result = await loop.run_in_executor(executor, func, root, batch, *args)
+            await out.put(result)
+
+    listed: asyncio.Queue = asyncio.Queue(queue_size)
+    output: asyncio.Queue = asyncio.Queue(queue_size)
+    pipeline = [stage(list_files(listed), listed)]
+    if spec.reads:
+        statted: asyncio.Queue = asyncio.Queue(queue_size)
+        stat = transform(listed, statted, _stat_batch, skip_missing)
+        read = transform(statted, output, _read_batch, spec, skip_missing)
+        pipeline += [stage(stat, statted), stage(read, output)]
+    else:
+        stat = transform(listed, output, _stat_batch, skip_missing)
+        pipeline.append(stage(stat, output))
+
+    tasks = [asyncio.ensure_future(coro) for coro in pipeline]
+    try:
+        while (batch := await receive(output)) is not None:
+            for entry in batch:
+                yield entry
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
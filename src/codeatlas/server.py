@@ -0,0 +1,439 @@
+"""Local HTTP server answering report requests from warm scan indexes.
+
+``codeatlas serve`` keeps one index per served root in memory so that
+repeated report requests skip interpreter startup and the directory walk.
+Reports are requested with ``GET /report`` and the query parameters
+
+``root``
+    One of the served roots.  Optional when only one root is served.
+``include`` / ``exclude``
+    Glob patterns, may be repeated.
+``format``
+    ``text`` (default), ``markdown`` or ``json``.
+``content``
+    ``1`` to inline file contents.
+``max_bytes``
+    Maximum number of content bytes per file.
+``refresh``
+    ``1`` to rescan the root before answering.
+
+Once an index is older than the TTL, requests keep being answered from it
+while a single background rescan replaces it.  Each index memoizes the
+entries selected by recent ``include``/``exclude`` combinations and the
+rendered reports without contents, and a rescan recomputes them before it
+is swapped in, so repeated queries never wait for a walk or for matching.
+
+Responses are streamed and the connection is closed once the report is sent.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import functools
+import logging
+import sys
+import time
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from contextlib import suppress
+from http import HTTPStatus
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qs, urlsplit
+
+from .formatter import iter_json, iter_markdown, iter_text
+from .extractor import read_text
+from .scanner import FileEntry, is_selected, scan
+
+__all__ = ["ReportServer", "serve"]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_TTL = 5.0
+
+_FORMATS: dict[str, tuple[Callable[[Iterable[FileEntry]], Iterator[str]], str]] = {
+    "text": (iter_text, "text/plain"),
+    "markdown": (iter_markdown, "text/markdown"),
+    "json": (iter_json, "application/json"),
+}
+_TRUE = {"1", "true", "yes", "on"}
+# Number of formatted pieces produced per executor round trip.
+_BATCH = 512
+# Number of selections and rendered reports memoized per index.
+_CACHE_SIZE = 32
+
+if TYPE_CHECKING:
+    # ``include`` and ``exclude`` patterns of a request.
+    _Selection = tuple[tuple[str, ...] | None, tuple[str, ...] | None]
+
+
+class _HTTPError(Exception):
+    """Error reported to the client with ``status``."""
+
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def _memoize(
+    cache: dict, key: object, compute: Callable[[], Awaitable[object]]
+) -> Awaitable:
+    """Return the result of ``compute()`` memoized in ``cache`` under ``key``.
+
+    Only called on the event loop, so the caches need no lock.  The cache holds
+    futures: concurrent callers for the same key share one computation, and a
+    failed computation is forgotten so the next caller retries it.
+    """
+    future = cache.get(key)
+    if future is None:
+        if len(cache) >= _CACHE_SIZE:
+            cache.pop(next(iter(cache)))
+        future = asyncio.ensure_future(compute())
+        cache[key] = future
+
+        def forget_failure(done: asyncio.Future) -> None:
+            if (done.cancelled() or done.exception()) and cache.get(key) is done:
+                del cache[key]
+
+        future.add_done_callback(forget_failure)
+    # One client going away must not cancel the result shared with others.
+    return asyncio.shield(future)
+
+
+def _filter(entries: list[FileEntry], selection: _Selection) -> list[FileEntry]:
+    include, exclude = selection
+    return [entry for entry in entries if is_selected(entry.path, include, exclude)]
+
+
+def _render(entries: list[FileEntry], fmt: str) -> str:
+    formatter, _ = _FORMATS[fmt]
+    return "".join(formatter(entries))
+
+
+@dataclasses.dataclass
+class _Index:
+    """Entries of a scanned root with memoized selections and reports.
+
+    The methods must be awaited on the event loop; the filtering and rendering
+    itself runs in the default executor.
+    """
+
+    entries: list[FileEntry]
+    created: float = 0.0
+    selections: dict[_Selection, asyncio.Future[list[FileEntry]]] = (
+        dataclasses.field(default_factory=dict)
+    )
+    reports: dict[tuple[_Selection, str], asyncio.Future[str]] = dataclasses.field(
+        default_factory=dict
+    )
+
+    async def select(self, selection: _Selection) -> list[FileEntry]:
+        """Return the entries matching ``selection``."""
+        if selection == (None, None):
+            return self.entries
+        loop = asyncio.get_running_loop()
+        return await _memoize(
+            self.selections,
+            selection,
+            lambda: loop.run_in_executor(None, _filter, self.entries, selection),
+        )
+
+    async def render(self, selection: _Selection, fmt: str) -> str:
+        """Return the report without contents for ``selection`` in ``fmt``."""
+
+        async def compute() -> str:
+            entries = await self.select(selection)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, _render, entries, fmt)
+
+        return await _memoize(self.reports, (selection, fmt), compute)
+
+    async def warm(self, previous: _Index) -> None:
+        """Precompute the selections and reports memoized by ``previous``."""
+        await asyncio.gather(
+            *(self.select(selection) for selection in list(previous.selections)),
+            *(self.render(*key) for key in list(previous.reports)),
+            return_exceptions=True,
+        )
+
+
+def _take(pieces: Iterator[str], count: int) -> list[str]:
+    """Return up to ``count`` items from ``pieces``."""
+    chunk: list[str] = []
+    for piece in pieces:
+        chunk.append(piece)
+        if len(chunk) >= count:
+            break
+    return chunk
+
+
+def _with_contents(
+    root: Path, entries: Iterable[FileEntry], max_bytes: int | None
+) -> Iterator[FileEntry]:
+    """Yield ``entries`` with contents read, skipping files removed since the scan."""
+    for entry in entries:
+        try:
+            content = read_text(root / entry.path, max_bytes)
+        except OSError as exc:
+            logger.debug("Skipping %s: %s", entry.path, exc)
+            continue
+        yield dataclasses.replace(entry, content=content)
+
+
+class ReportServer:
+    """Serve reports for ``roots`` from in-memory scan indexes.
+
+    Parameters
+    ----------
+    roots:
+        Directories clients may request reports for.
+    ttl:
+        Seconds an index stays fresh before the next request rescans the root.
+    """
+
+    def __init__(self, roots: Iterable[Path], *, ttl: float = DEFAULT_TTL) -> None:
+        self.roots = [Path(root).resolve() for root in roots]
+        if not self.roots:
+            raise ValueError("at least one root is required")
+        self.ttl = ttl
+        self._indexes: dict[Path, _Index] = {}
+        self._pending: dict[Path, asyncio.Future[_Index]] = {}
+
+    async def index(self, root: Path, *, refresh: bool = False) -> list[FileEntry]:
+        """Return the cached entries for ``root``.
+
+        A stale index is returned as is while a rescan runs in the background.
+        Only a missing index or ``refresh`` waits for the scan.  Concurrent
+        callers share a single rescan of the same root.
+        """
+        index = await self._index(Path(root).resolve(), refresh=refresh)
+        return index.entries
+
+    async def _index(self, root: Path, *, refresh: bool = False) -> _Index:
+        cached = self._indexes.get(root)
+        pending = self._pending.get(root)
+        if cached is not None and not refresh:
+            if pending is None and time.monotonic() - cached.created >= self.ttl:
+                self._start_rescan(root)
+            return cached
+        if pending is None:
+            pending = self._start_rescan(root)
+        return await asyncio.shield(pending)
+
+    def _start_rescan(self, root: Path) -> asyncio.Future[_Index]:
+        pending = asyncio.ensure_future(self._rescan(root))
+        self._pending[root] = pending
+
+        def done(future: asyncio.Future[_Index]) -> None:
+            self._pending.pop(root, None)
+            if not future.cancelled() and future.exception() is not None:
+                logger.warning("Rescan of %s failed: %s", root, future.exception())
+
+        pending.add_done_callback(done)
+        return pending
+
+    async def _rescan(self, root: Path) -> _Index:
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        # Editor swap files and lock files come and go while a live tree is
+        # walked; one of them vanishing must not fail the whole rescan.
+        walk = functools.partial(scan, root, skip_missing=True)
+        index = _Index(entries=await loop.run_in_executor(None, walk))
+        previous = self._indexes.get(root)
+        if previous is not None:
+            await index.warm(previous)
+        # Freshness counts from when the index is complete, not when the walk
+        # started, so a walk longer than the TTL does not trigger another one.
+        index.created = time.monotonic()
+        logger.debug(
+            "Indexed %s: %d files in %.3fs",
+            root,
+            len(index.entries),
+            index.created - started,
+        )
+        self._indexes[root] = index
+        return index
+
+    def _resolve_root(self, values: list[str]) -> Path:
+        if not values:
+            if len(self.roots) == 1:
+                return self.roots[0]
+            raise _HTTPError(HTTPStatus.BAD_REQUEST, "missing 'root' parameter")
+        root = Path(values[-1]).resolve()
+        if root not in self.roots:
+            raise _HTTPError(HTTPStatus.FORBIDDEN, f"root not served: {values[-1]}")
+        return root
+
+    async def _report(self, target: str) -> tuple[Iterator[str], str]:
+        """Return the report pieces and content type for request ``target``."""
+        url = urlsplit(target)
+        if url.path != "/report":
+            raise _HTTPError(HTTPStatus.NOT_FOUND, f"unknown path: {url.path}")
+        params = parse_qs(url.query, keep_blank_values=True)
+
+        root = self._resolve_root(params.get("root", []))
+        fmt = params.get("format", ["text"])[-1]
+        if fmt not in _FORMATS:
+            raise _HTTPError(HTTPStatus.BAD_REQUEST, f"unknown format: {fmt}")
+        max_bytes: int | None = None
+        if params.get("max_bytes"):
+            try:
+                max_bytes = int(params["max_bytes"][-1])
+            except ValueError:
+                raise _HTTPError(
+                    HTTPStatus.BAD_REQUEST, "'max_bytes' must be an integer"
+                ) from None
+        include = params.get("include")
+        exclude = params.get("exclude")
+        for name, patterns in (("include", include), ("exclude", exclude)):
+            for pattern in patterns or ():
+                try:
+                    is_selected(Path("probe"), [pattern], None)
+                except ValueError as exc:
+                    raise _HTTPError(
+                        HTTPStatus.BAD_REQUEST, f"invalid '{name}' pattern: {exc}"
+                    ) from None
+        refresh = params.get("refresh", [""])[-1].lower() in _TRUE
+        content = params.get("content", [""])[-1].lower() in _TRUE
+
+        selection = (
+            tuple(include) if include is not None else None,
+            tuple(exclude) if exclude is not None else None,
+        )
+
+        index = await self._index(root, refresh=refresh)
+        formatter, content_type = _FORMATS[fmt]
+        if not content:
+            report = await index.render(selection, fmt)
+            return iter((report,)), content_type
+        # Contents are read lazily while streaming, off the loop.
+        entries = await index.select(selection)
+        return formatter(_with_contents(root, entries, max_bytes)), content_type
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answer a single HTTP request and close the connection."""
+        started = time.monotonic()
+        try:
+            try:
+                target = await self._read_request(reader)
+                pieces, content_type = await self._report(target)
+            except _HTTPError as exc:
+                self._write_head(writer, exc.status, "text/plain")
+                writer.write(f"{exc}\n".encode("utf-8"))
+            except Exception as exc:
+                logger.exception("Failed to build report")
+                self._write_head(writer, HTTPStatus.INTERNAL_SERVER_ERROR, "text/plain")
+                writer.write(f"{type(exc).__name__}: {exc}\n".encode("utf-8"))
+            else:
+                self._write_head(writer, HTTPStatus.OK, content_type)
+                await self._stream(writer, pieces)
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError) as exc:
+            logger.debug("Client went away: %s", exc)
+        except Exception:  # pragma: no cover - failures while streaming
+            logger.exception("Failed to answer request")
+        finally:
+            logger.debug("Request handled in %.3fs", time.monotonic() - started)
+            writer.close()
+            with suppress(ConnectionError):
+                await writer.wait_closed()
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> str:
+        """Read the request head and return the request target."""
+        try:
+            line = await reader.readline()
+            while True:
+                header = await reader.readline()
+                if header in (b"\r\n", b"\n", b""):
+                    break
+        except (asyncio.LimitOverrunError, ValueError):
+            raise _HTTPError(HTTPStatus.BAD_REQUEST, "request too large") from None
+        parts = line.decode("latin-1").split()
+        if len(parts) != 3:
+            raise _HTTPError(HTTPStatus.BAD_REQUEST, "malformed request line")
+        method, target, _ = parts
+        if method != "GET":
+            raise _HTTPError(
+                HTTPStatus.METHOD_NOT_ALLOWED, f"unsupported method: {method}"
+            )
+        return target
+
+    @staticmethod
+    def _write_head(
+        writer: asyncio.StreamWriter, status: HTTPStatus, content_type: str
+    ) -> None:
+        writer.write(
+            (
+                f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                f"Content-Type: {content_type}; charset=utf-8\r\n"
+                "Connection: close\r\n"
+                "\r\n"
+            ).encode("latin-1")
+        )
+
+    @staticmethod
+    async def _stream(writer: asyncio.StreamWriter, pieces: Iterator[str]) -> None:
+        """Write ``pieces`` in batches produced off the event loop."""
+        loop = asyncio.get_running_loop()
+        while True:
+            chunk = await loop.run_in_executor(None, _take, pieces, _BATCH)
+            if not chunk:
+                break
+            writer.write("".join(chunk).encode("utf-8"))
+            await writer.drain()
+
+    async def start(
+        self,
+        *,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        unix_socket: Path | None = None,
+    ) -> asyncio.AbstractServer:
+        """Warm the indexes of all roots and start listening.
+
+        Roots that fail to scan are logged and retried on the next request.
+
+        Parameters
+        ----------
+        host, port:
+            TCP address to listen on.  Ignored when ``unix_socket`` is given.
+        unix_socket:
+            Path of a unix domain socket to listen on instead of TCP.
+        """
+        results = await asyncio.gather(
+            *(self._index(root) for root in self.roots), return_exceptions=True
+        )
+        for root, result in zip(self.roots, results):
+            if isinstance(result, Exception):
+                logger.warning("Initial scan of %s failed: %s", root, result)
+        if unix_socket is not None:
+            return await asyncio.start_unix_server(self.handle, path=str(unix_socket))
+        return await asyncio.start_server(self.handle, host, port)
+
+
+def serve(
+    roots: Iterable[Path],
+    *,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    unix_socket: Path | None = None,
+    ttl: float = DEFAULT_TTL,
+) -> None:
+    """Run a :class:`ReportServer` for ``roots`` until interrupted."""
+
+    async def run() -> None:
+        server = await ReportServer(roots, ttl=ttl).start(
+            host=host, port=port, unix_socket=unix_socket
+        )
+        for sock in server.sockets:
+            print(f"codeatlas serving on {sock.getsockname()}", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+    with suppress(KeyboardInterrupt):
+        asyncio.run(run())
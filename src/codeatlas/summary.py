@@ -0,0 +1,145 @@
+"""Aggregate statistics for a directory tree computed in a single pass."""
+
+from __future__ import annotations
+
+import heapq
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .scanner import FileEntry, iter_scan
+
+__all__ = ["Aggregate", "Summary", "summarize"]
+
+
+@dataclass
+class Aggregate:
+    """File count, total size and newest modification time of a group of files.
+
+    ``newest`` is ``None`` while the group is empty.
+    """
+
+    files: int = 0
+    size: int = 0
+    newest: float | None = None
+
+    def add(self, size: int, mtime: float) -> None:
+        """Account for a single file."""
+        self.files += 1
+        self.size += size
+        if self.newest is None or mtime > self.newest:
+            self.newest = mtime
+
+    def merge(self, other: Aggregate) -> None:
+        """Fold the totals of ``other`` into this aggregate."""
+        self.files += other.files
+        self.size += other.size
+        if other.newest is not None and (
+            self.newest is None or other.newest > self.newest
+        ):
+            self.newest = other.newest
+
+
+@dataclass
+class Summary:
+    """Rolled-up statistics of a scanned tree.
+
+    Attributes
+    ----------
+    root:
+        The scanned directory.
+    top:
+        Number of items kept in :attr:`largest` and :attr:`newest` and
+        reported by :meth:`top_directories` and :meth:`top_extensions`.
+    total:
+        Totals over all selected files.
+    directories:
+        Totals per directory relative to ``root``, including subdirectories.
+        ``Path(".")`` holds the totals of ``root`` itself.
+    extensions:
+        Totals per lower-cased file suffix; ``""`` for files without one.
+    largest, newest:
+        The ``top`` largest and most recently modified files, in descending
+        order.
+    """
+
+    root: Path
+    top: int
+    total: Aggregate = field(default_factory=Aggregate)
+    directories: dict[Path, Aggregate] = field(default_factory=dict)
+    extensions: dict[str, Aggregate] = field(default_factory=dict)
+    largest: list[FileEntry] = field(default_factory=list)
+    newest: list[FileEntry] = field(default_factory=list)
+
+    def top_directories(self) -> list[tuple[Path, Aggregate]]:
+        """Return the ``top`` directories with the largest total size."""
+        return heapq.nlargest(
+            self.top, self.directories.items(), key=lambda item: item[1].size
+        )
+
+    def top_extensions(self) -> list[tuple[str, Aggregate]]:
+        """Return the ``top`` extensions with the largest total size."""
+        return heapq.nlargest(
+            self.top, self.extensions.items(), key=lambda item: item[1].size
+        )
+
+
+def summarize(
+    root: Path,
+    *,
+    include: Iterable[str] | None = None,
+    exclude: Iterable[str] | None = None,
+    top: int = 10,
+) -> Summary:
+    """Compute a :class:`Summary` of ``root`` in one walk.
+
+    Entries are folded into the aggregates as they are scanned and then
+    discarded, so memory grows with the number of directories and extensions
+    but not with the number of files.
+
+    Parameters
+    ----------
+    root:
+        Directory to scan.
+    include, exclude:
+        Glob patterns, as for :func:`~codeatlas.scanner.scan`.
+    top:
+        Number of largest and newest files to keep.
+    """
+    summary = Summary(root=Path(root), top=top)
+    # Min-heaps of at most ``top`` items.  The negated counter favours earlier
+    # files on ties and keeps FileEntry objects from being compared.
+    largest: list[tuple[int, int, FileEntry]] = []
+    newest: list[tuple[float, int, FileEntry]] = []
+
+    for seq, entry in enumerate(iter_scan(root, include=include, exclude=exclude)):
+        summary.total.add(entry.size, entry.mtime)
+        parent, suffix = entry.path.parent, entry.path.suffix.lower()
+        summary.directories.setdefault(parent, Aggregate()).add(entry.size, entry.mtime)
+        summary.extensions.setdefault(suffix, Aggregate()).add(entry.size, entry.mtime)
+        if top > 0:
+            _push_bounded(largest, (entry.size, -seq, entry), top)
+            _push_bounded(newest, (entry.mtime, -seq, entry), top)
+
+    _roll_up(summary.directories)
+    summary.largest = [item[2] for item in sorted(largest, reverse=True)]
+    summary.newest = [item[2] for item in sorted(newest, reverse=True)]
+    return summary
+
+
+def _push_bounded(heap: list, item: tuple, size: int) -> None:
+    """Push ``item`` onto ``heap`` keeping only the ``size`` largest items."""
+    if len(heap) < size:
+        heapq.heappush(heap, item)
+    elif item > heap[0]:
+        heapq.heapreplace(heap, item)
+
+
+def _roll_up(directories: dict[Path, Aggregate]) -> None:
+    """Turn per-directory totals into totals that include subdirectories."""
+    for directory in list(directories):
+        for parent in directory.parents:
+            directories.setdefault(parent, Aggregate())
+    for directory in sorted(directories, key=lambda p: len(p.parts), reverse=True):
+        if directory.parts:
+            directories[directory.parent].merge(directories[directory])
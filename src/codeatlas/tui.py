@@ -61,13 +61,13 @@ def _save_state(data: dict[str, list[str]]) -> None:
     path.write_text(json.dumps(data, ensure_ascii=False, indent=2))
 
 
-pyperclip: Any | None
-try:
-    import pyperclip as _pyperclip  # type: ignore
-
-    pyperclip = _pyperclip
-except Exception:  # pragma: no cover - fallback when pyperclip unavailable
-    pyperclip = None
+def _load_pyperclip() -> Any | None:
+    """Import :mod:`pyperclip` on first use, returning ``None`` if unavailable."""
+    try:
+        import pyperclip  # type: ignore
+    except Exception:  # pragma: no cover - fallback when pyperclip unavailable
+        return None
+    return pyperclip
 
 
 def _shorten_left(text: str, width: int) -> str:
@@ -248,6 +248,7 @@ class AtlasTUI(App):
     def action_copy(self) -> None:
         try:
             text = self._build_report()
+            pyperclip = _load_pyperclip()
             if pyperclip is not None:
                 pyperclip.copy(text)
                 self.notify("Copied report to clipboard")
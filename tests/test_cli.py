@@ -2,12 +2,23 @@
 
 from __future__ import annotations
 
+import io
+import json
+import os
+import subprocess
+import sys
 import tempfile
 import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
 
 from codeatlas import cli
 
 
+FIXTURE = Path(__file__).parent / "fixtures" / "simple_tree"
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+
 class TestCLI(unittest.TestCase):
     """Unit tests for :mod:`codeatlas.cli`."""
 
@@ -16,6 +27,89 @@ class TestCLI(unittest.TestCase):
         with tempfile.TemporaryDirectory() as tmpdir:
             self.assertEqual(cli.main(["--root", tmpdir]), 0)
 
+    def test_format_json(self) -> None:
+        out = io.StringIO()
+        with redirect_stdout(out):
+            cli.main(["--root", str(FIXTURE), "--format", "json", "--exclude", "*.log"])
+        data = json.loads(out.getvalue())
+        self.assertEqual([d["path"] for d in data], ["foo.txt", "sub/bar.txt"])
+
+    def test_line_options(self) -> None:
+        out = io.StringIO()
+        with redirect_stdout(out):
+            cli.main(["--root", str(FIXTURE), "--format", "json", "--head-lines", "1"])
+        data = json.loads(out.getvalue())
+        self.assertEqual(data[0]["content"], "foo\n")
+        with self.assertRaises(SystemExit), redirect_stderr(io.StringIO()):
+            cli.main(["--root", str(FIXTURE), "--lines", "*.log:3-1"])
+
+    def test_lines_inline_only_matching_files(self) -> None:
+        argv = ["--root", str(FIXTURE), "--format", "json", "--lines", "*.log:1"]
+        for extra, unmatched in (([], None), (["--content"], "foo\n")):
+            out = io.StringIO()
+            with redirect_stdout(out):
+                cli.main(argv + extra)
+            contents = {e["path"]: e["content"] for e in json.loads(out.getvalue())}
+            self.assertEqual(contents["sub/skip.log"], "should be skipped\n")
+            self.assertEqual(contents["foo.txt"], unmatched)
+
+    def test_summary(self) -> None:
+        out = io.StringIO()
+        with redirect_stdout(out):
+            cli.main(["--root", str(FIXTURE), "--summary", "--format", "json"])
+        data = json.loads(out.getvalue())
+        self.assertEqual(data["total"]["files"], 3)
+        self.assertEqual(data["largest"][0]["path"], "sub/skip.log")
+        for option in (
+            ["--content"],
+            ["--max-bytes", "10"],
+            ["--head-lines", "1"],
+            ["--tail-lines", "1"],
+            ["--lines", "*.log:1"],
+            ["--top", "-1"],
+        ):
+            err = io.StringIO()
+            with self.assertRaises(SystemExit), redirect_stderr(err):
+                cli.main(["--root", str(FIXTURE), "--summary", *option])
+            self.assertIn(option[0], err.getvalue())
+
+    def test_import_is_lightweight(self) -> None:
+        """Importing the CLI must not load the TUI, server or formatters."""
+        code = (
+            "import sys, codeatlas.cli; "
+            "print(' '.join(m for m in sys.modules if m.split('.')[0] in "
+            "{'textual', 'pyperclip', 'asyncio', 'json'} or m in "
+            "{'codeatlas.tui', 'codeatlas.server', 'codeatlas.formatter'}))"
+        )
+        env = dict(os.environ, PYTHONPATH=str(SRC))
+        proc = subprocess.run(
+            [sys.executable, "-c", code],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(proc.stdout.strip(), "")
+
+    def test_listing_skips_summary_imports(self) -> None:
+        """Plain listings must not load the summary code or :mod:`datetime`."""
+        code = (
+            "import contextlib, io, sys, codeatlas.cli; "
+            "contextlib.redirect_stdout(io.StringIO()).__enter__(); "
+            f"codeatlas.cli.main(['--root', {str(FIXTURE)!r}]); "
+            "sys.stderr.write(' '.join(m for m in sys.modules if m in "
+            "{'datetime', 'codeatlas.summary'}))"
+        )
+        env = dict(os.environ, PYTHONPATH=str(SRC))
+        proc = subprocess.run(
+            [sys.executable, "-c", code],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(proc.stderr.strip(), "")
+
 
 if __name__ == "__main__":  # pragma: no cover - manual execution
     unittest.main()
@@ -5,7 +5,9 @@ from __future__ import annotations
 import tempfile
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
+from codeatlas import extractor
 from codeatlas.extractor import read_text
 
 
@@ -24,6 +26,15 @@ class TestExtractor(unittest.TestCase):
             p.write_text("abcdef")
             self.assertEqual(read_text(p, max_bytes=3), "abc")
 
+    def test_truncation_inside_character(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            p = Path(tmpdir) / "utf8.txt"
+            p.write_text("aé€", encoding="utf-8")
+            self.assertEqual(read_text(p, max_bytes=2), "a")
+            self.assertEqual(read_text(p, max_bytes=5), "aé")
+            p.write_bytes("écrit".encode("latin-1"))
+            self.assertEqual(read_text(p, max_bytes=3), "écr")
+
     def test_non_utf8(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
             p = Path(tmpdir) / "latin1.txt"
@@ -31,6 +42,42 @@ class TestExtractor(unittest.TestCase):
             p.write_bytes(data)
             self.assertEqual(read_text(p), "café")
 
+    def test_head_and_tail_lines(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            p = Path(tmpdir) / "lines.txt"
+            p.write_text("1\n2\n3\n4\n5\n")
+            self.assertEqual(read_text(p, head_lines=2), "1\n2\n")
+            self.assertEqual(read_text(p, tail_lines=2), "4\n5\n")
+            self.assertEqual(read_text(p, head_lines=1, tail_lines=1), "1\n…\n5\n")
+            self.assertEqual(read_text(p, head_lines=2, tail_lines=3), p.read_text())
+            self.assertEqual(read_text(p, head_lines=0, tail_lines=1), "5\n")
+            self.assertEqual(read_text(p, head_lines=3, tail_lines=3), p.read_text())
+            self.assertEqual(read_text(p, tail_lines=10), p.read_text())
+
+    def test_tail_without_trailing_newline(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            p = Path(tmpdir) / "lines.txt"
+            p.write_text("a\nb\nc")
+            self.assertEqual(read_text(p, tail_lines=2), "b\nc")
+
+    def test_line_range(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            p = Path(tmpdir) / "lines.txt"
+            p.write_text("1\n2\n3\n4\n")
+            self.assertEqual(read_text(p, line_range=(2, 3)), "2\n3\n")
+            self.assertEqual(read_text(p, line_range=(3, None)), "3\n4\n")
+            with self.assertRaises(ValueError):
+                read_text(p, line_range=(0, 2))
+
+    def test_lines_keep_multibyte_characters(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            p = Path(tmpdir) / "utf8.txt"
+            p.write_text("日本\néé\n語\n", encoding="utf-8")
+            with patch.object(extractor, "_CHUNK_SIZE", 2):
+                self.assertEqual(read_text(p, head_lines=1), "日本\n")
+                self.assertEqual(read_text(p, tail_lines=2), "éé\n語\n")
+                self.assertEqual(read_text(p, line_range=(2, 2)), "éé\n")
+
 
 if __name__ == "__main__":  # pragma: no cover - manual execution
     unittest.main()
@@ -8,8 +8,21 @@ import json
 import unittest
 from pathlib import Path
 
-from codeatlas.formatter import to_markdown, to_json, to_text
+from codeatlas.formatter import (
+    iter_json,
+    iter_markdown,
+    iter_text,
+    summary_to_json,
+    summary_to_markdown,
+    summary_to_text,
+    to_json,
+    to_markdown,
+    to_text,
+)
 from codeatlas.scanner import FileEntry
+from codeatlas.summary import Summary, summarize
+
+FIXTURE = Path(__file__).parent / "fixtures" / "simple_tree"
 
 
 def sample_entries() -> list[FileEntry]:
@@ -34,6 +47,27 @@ class TestFormatter(unittest.TestCase):
         self.assertEqual(data[0]["path"], "foo.txt")
         self.assertEqual(data[0]["content"], "foo")
 
+    def test_iter_matches_to(self) -> None:
+        many = sample_entries() + [FileEntry(Path("sub/bar.txt"), 0, 1.0)]
+        for entries in ([], many):
+            self.assertEqual("".join(iter_text(entries)), to_text(entries))
+            self.assertEqual("".join(iter_markdown(entries)), to_markdown(entries))
+            self.assertEqual("".join(iter_json(entries)), to_json(entries))
+
+    def test_summary_formatters(self) -> None:
+        summary = summarize(FIXTURE)
+        self.assertIn("sub/ (size=22, files=2", summary_to_text(summary))
+        self.assertIn("| `sub/skip.log` | 18 |", summary_to_markdown(summary))
+        data = json.loads(summary_to_json(summary))
+        self.assertEqual(data["total"]["files"], 3)
+        self.assertEqual(data["largest"][0]["path"], "sub/skip.log")
+
+    def test_empty_summary(self) -> None:
+        summary = Summary(root=Path("empty"), top=10)
+        self.assertIn("newest=-", summary_to_text(summary))
+        self.assertIn("- newest: -", summary_to_markdown(summary))
+        self.assertIsNone(json.loads(summary_to_json(summary))["total"]["newest"])
+
 
 if __name__ == "__main__":  # pragma: no cover - manual execution
     unittest.main()
@@ -2,10 +2,16 @@
 
 from __future__ import annotations
 
+import asyncio
+import os
+import tempfile
 import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
+from unittest.mock import patch
 
-from codeatlas.scanner import scan
+from codeatlas import scanner
+from codeatlas.scanner import ascan, scan
 
 
 FIXTURE = Path(__file__).parent / "fixtures" / "simple_tree"
@@ -34,6 +40,93 @@ class TestScanner(unittest.TestCase):
         foo = next(e for e in entries if e.path.name == "foo.txt")
         self.assertEqual(foo.content, "foo\n")
 
+    def test_scan_line_selection(self) -> None:
+        entries = scan(
+            FIXTURE,
+            include_contents=True,
+            head_lines=0,
+            line_ranges={"*.log": (1, 1)},
+        )
+        contents = {entry.path.as_posix(): entry.content for entry in entries}
+        self.assertEqual(contents["foo.txt"], "")
+        self.assertEqual(contents["sub/skip.log"], "should be skipped\n")
+
+    def test_scan_line_ranges_read_only_matching_files(self) -> None:
+        entries = scan(FIXTURE, line_ranges={"*.log": (1, 1)})
+        contents = {entry.path.as_posix(): entry.content for entry in entries}
+        self.assertEqual(contents["sub/skip.log"], "should be skipped\n")
+        self.assertIsNone(contents["foo.txt"])
+        self.assertIsNone(contents["sub/bar.txt"])
+
+    def test_scan_skip_missing(self) -> None:
+        listing = scanner._list_dir(FIXTURE) + [("removed.txt", False)]
+        with patch.object(scanner, "_list_dir", side_effect=[listing, []]):
+            with self.assertRaises(FileNotFoundError):
+                scan(FIXTURE)
+        with patch.object(scanner, "_list_dir", side_effect=[listing, []]):
+            entries = scan(FIXTURE, skip_missing=True, include_contents=True)
+        self.assertNotIn("removed.txt", [e.path.as_posix() for e in entries])
+        self.assertIn("foo.txt", [e.path.as_posix() for e in entries])
+
+
+class TestAsyncScanner(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for :func:`codeatlas.scanner.ascan`."""
+
+    async def test_ascan_matches_scan(self) -> None:
+        for kwargs in (
+            {},
+            {"exclude": ["*.log"]},
+            {"include": ["sub/*"], "include_contents": True, "max_bytes": 2},
+            {
+                "include_contents": True,
+                "tail_lines": 1,
+                "line_ranges": {"*.log": (1, 1)},
+            },
+            {"line_ranges": {"*.log": (1, 1)}},
+        ):
+            entries = [entry async for entry in ascan(FIXTURE, **kwargs)]
+            self.assertEqual(entries, scan(FIXTURE, **kwargs))
+
+    async def test_ascan_close_stops_pipeline(self) -> None:
+        before = asyncio.all_tasks()
+        it = ascan(FIXTURE, include_contents=True, queue_size=1)
+        first = await it.__anext__()
+        self.assertEqual(first.path.as_posix(), "foo.txt")
+        await it.aclose()
+        self.assertEqual(asyncio.all_tasks(), before)
+
+    async def test_ascan_rejects_empty_queues(self) -> None:
+        for queue_size in (0, -1):
+            with self.assertRaises(ValueError):
+                _ = [entry async for entry in ascan(FIXTURE, queue_size=queue_size)]
+
+    async def test_ascan_rejects_process_pools(self) -> None:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            with self.assertRaises(TypeError):
+                _ = [entry async for entry in ascan(FIXTURE, executor=executor)]
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            entries = [entry async for entry in ascan(FIXTURE, executor=executor)]
+        self.assertEqual(entries, scan(FIXTURE))
+
+    @unittest.skipIf(os.name == "nt", "symlinks require privileges on Windows")
+    async def test_ascan_skip_missing(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            os.symlink("missing", Path(tmpdir) / "broken")
+            (Path(tmpdir) / "kept.txt").write_text("kept")
+            for kwargs in ({}, {"include_contents": True}):
+                entries = [
+                    entry
+                    async for entry in ascan(Path(tmpdir), skip_missing=True, **kwargs)
+                ]
+                self.assertEqual([e.path.name for e in entries], ["kept.txt"])
+
+    @unittest.skipIf(os.name == "nt", "symlinks require privileges on Windows")
+    async def test_ascan_propagates_errors(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            os.symlink("missing", Path(tmpdir) / "broken")
+            with self.assertRaises(FileNotFoundError):
+                _ = [entry async for entry in ascan(Path(tmpdir))]
+
 
 if __name__ == "__main__":  # pragma: no cover - manual execution
     unittest.main()
@@ -0,0 +1,164 @@
+"""Tests for the report server."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from codeatlas import server
+from codeatlas.server import ReportServer
+
+
+FIXTURE = Path(__file__).parent / "fixtures" / "simple_tree"
+
+
+async def fetch(port: int, target: str) -> tuple[str, str]:
+    """Return the status line and body of ``GET target``."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    head, _, body = raw.decode("utf-8").partition("\r\n\r\n")
+    return head.splitlines()[0], body
+
+
+class TestReportServer(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for :mod:`codeatlas.server`."""
+
+    async def asyncSetUp(self) -> None:
+        self.report_server = ReportServer([FIXTURE])
+        self.server = await self.report_server.start(port=0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def test_json_report_with_filters(self) -> None:
+        status, body = await fetch(
+            self.port, "/report?format=json&exclude=*.log&content=1"
+        )
+        self.assertIn("200", status)
+        data = json.loads(body)
+        self.assertEqual([d["path"] for d in data], ["foo.txt", "sub/bar.txt"])
+        self.assertEqual(data[0]["content"], "foo\n")
+
+    async def test_text_report_include(self) -> None:
+        status, body = await fetch(self.port, "/report?include=*.log")
+        self.assertIn("200", status)
+        self.assertEqual(body, "sub/skip.log (size=18)")
+
+    async def test_errors(self) -> None:
+        status, _ = await fetch(self.port, "/nope")
+        self.assertIn("404", status)
+        status, _ = await fetch(self.port, "/report?format=yaml")
+        self.assertIn("400", status)
+        status, _ = await fetch(self.port, "/report?root=/")
+        self.assertIn("403", status)
+        for query in ("include=", "exclude=", "include=*.txt&include=."):
+            status, body = await fetch(self.port, f"/report?{query}")
+            self.assertIn("400", status)
+            self.assertIn("pattern", body)
+
+    async def test_concurrent_rescans_are_coalesced(self) -> None:
+        with patch.object(server, "scan", wraps=server.scan) as mock_scan:
+            results = await asyncio.gather(
+                *(self.report_server.index(FIXTURE, refresh=True) for _ in range(5))
+            )
+        self.assertEqual(mock_scan.call_count, 1)
+        self.assertTrue(all(r is results[0] for r in results))
+
+    async def test_concurrent_selections_are_coalesced(self) -> None:
+        await self.report_server.index(FIXTURE)
+        index = self.report_server._indexes[FIXTURE.resolve()]
+        with patch.object(server, "_filter", wraps=server._filter) as mock_filter:
+            results = await asyncio.gather(
+                *(index.render((("*.txt",), None), "text") for _ in range(3)),
+                *(index.select((("*.txt",), None)) for _ in range(3)),
+            )
+        self.assertEqual(mock_filter.call_count, 1)
+        self.assertEqual(results[0], "foo.txt (size=4)\nsub/bar.txt (size=4)")
+
+
+class TestReportServerFreshness(unittest.IsolatedAsyncioTestCase):
+    """Rescans, failures and caching of :class:`ReportServer`."""
+
+    async def asyncSetUp(self) -> None:
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmpdir.name)
+        for d in range(20):
+            sub = self.root / f"d{d}"
+            sub.mkdir()
+            for f in range(100):
+                (sub / f"f{f}.{'log' if f % 3 == 0 else 'py'}").write_text("x\n")
+        self.report_server = ReportServer([self.root], ttl=0)
+        self.server = await self.report_server.start(port=0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+        for pending in list(self.report_server._pending.values()):
+            await asyncio.gather(pending, return_exceptions=True)
+        self._tmpdir.cleanup()
+
+    async def test_stale_index_served_while_rescanning(self) -> None:
+        original_scan = server.scan
+        release = threading.Event()
+
+        def blocked_scan(root: Path, **kwargs: object) -> list:
+            release.wait(10)
+            return original_scan(root, **kwargs)
+
+        (self.root / "new.txt").write_text("new")
+        with patch.object(server, "scan", blocked_scan):
+            try:
+                status, body = await fetch(self.port, "/report?include=new.txt")
+                self.assertIn("200", status)
+                self.assertEqual(body, "")
+                self.assertIn(self.root.resolve(), self.report_server._pending)
+            finally:
+                release.set()
+            await asyncio.gather(*self.report_server._pending.values())
+        _, body = await fetch(self.port, "/report?include=new.txt")
+        self.assertEqual(body, "new.txt (size=3)")
+
+    async def test_warm_requests_hit_the_report_cache(self) -> None:
+        self.report_server.ttl = 3600
+        target = "/report?format=json&include=*.log&exclude=d1/*"
+        status, body = await fetch(self.port, target)
+        self.assertIn("200", status)
+        self.assertEqual(len(json.loads(body)), 19 * 34)
+        with patch.object(server, "_filter") as mock_filter, patch.object(
+            server, "_render"
+        ) as mock_render:
+            for _ in range(3):
+                _, warm = await fetch(self.port, target)
+                self.assertEqual(warm, body)
+        mock_filter.assert_not_called()
+        mock_render.assert_not_called()
+
+    @unittest.skipIf(os.name == "nt", "symlinks require privileges on Windows")
+    async def test_missing_files_are_skipped(self) -> None:
+        os.symlink("missing", self.root / "broken")
+        status, body = await fetch(self.port, "/report?refresh=1&include=d0/f0.log")
+        self.assertIn("200", status)
+        self.assertEqual(body, "d0/f0.log (size=2)")
+
+    async def test_failed_scan_returns_500(self) -> None:
+        with patch.object(server, "scan", side_effect=PermissionError("denied")):
+            status, body = await fetch(self.port, "/report?refresh=1")
+        self.assertIn("500", status)
+        self.assertIn("PermissionError: denied", body)
+
+
+if __name__ == "__main__":  # pragma: no cover - manual execution
+    unittest.main()
@@ -0,0 +1,55 @@
+"""Tests for single-pass tree summaries."""
+
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from codeatlas.scanner import scan
+from codeatlas.summary import summarize
+
+
+FIXTURE = Path(__file__).parent / "fixtures" / "simple_tree"
+
+
+class TestSummary(unittest.TestCase):
+    """Unit tests for :mod:`codeatlas.summary`."""
+
+    def test_totals_match_scan(self) -> None:
+        entries = scan(FIXTURE)
+        summary = summarize(FIXTURE)
+        self.assertEqual(summary.total.files, len(entries))
+        self.assertEqual(summary.total.size, sum(e.size for e in entries))
+        self.assertEqual(summary.total.newest, max(e.mtime for e in entries))
+
+    def test_directories_are_rolled_up(self) -> None:
+        summary = summarize(FIXTURE)
+        root = summary.directories[Path(".")]
+        sub = summary.directories[Path("sub")]
+        self.assertEqual((root.files, root.size), (3, 26))
+        self.assertEqual((sub.files, sub.size), (2, 22))
+
+    def test_extensions_and_filters(self) -> None:
+        summary = summarize(FIXTURE, exclude=["*.log"])
+        self.assertEqual(set(summary.extensions), {".txt"})
+        self.assertEqual(summary.extensions[".txt"].files, 2)
+
+    def test_top_files(self) -> None:
+        summary = summarize(FIXTURE, top=2)
+        self.assertEqual(
+            [e.path.as_posix() for e in summary.largest], ["sub/skip.log", "foo.txt"]
+        )
+        self.assertEqual(len(summary.newest), 2)
+        self.assertEqual(len(summary.top_directories()), 2)
+
+    def test_empty_tree(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            summary = summarize(Path(tmpdir))
+        self.assertEqual((summary.total.files, summary.total.size), (0, 0))
+        self.assertIsNone(summary.total.newest)
+        self.assertEqual(summary.top_directories(), [])
+
+
+if __name__ == "__main__":  # pragma: no cover - manual execution
+    unittest.main()